@@ -1,11 +1,16 @@
 import json
 import re
+import threading
 from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from openai import OpenAI
 from config import OPENAI_API_KEY
 from query_engine import (
     get_work_orders_df,
     get_deals_df,
+    load_all_boards,
     get_data_summary,
     get_all_columns,
     analyze_pipeline,
@@ -15,15 +20,29 @@ from query_engine import (
     filter_by_sector,
     filter_by_date_range,
     get_quarterly_data,
+    get_data_version,
+    get_numeric_column,
+    aggregate_board,
+    get_precomputed_breakdowns,
+    BREAKDOWN_COLUMNS,
     clear_cache
 )
 from data_processor import get_data_quality_report, get_column_summary
-import pandas as pd
 
 
 # Initialize OpenAI client
 client = OpenAI(api_key=OPENAI_API_KEY)
 
+# Answers keyed on (normalized question, data version, history), least recently used evicted first
+_response_cache = OrderedDict()
+_RESPONSE_CACHE_SIZE = 512
+_response_cache_lock = threading.Lock()  # shared by all Streamlit sessions
+
+# Background workers for prefetching data analysis while the UI renders. Shared by all
+# sessions, so sized like the default pool rather than a couple of threads that one
+# session's cold-start Monday fetch could hold up for everyone else.
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="prefetch")
+
 
 def get_system_prompt():
     """Generate system prompt with current data context."""
@@ -62,9 +81,42 @@ If asked to prepare leadership updates, structure the response with:
 - Key Metrics
 - Notable Insights
 - Areas of Concern
+
+Each question arrives with pre-computed data analysis results. Provide a clear, insightful answer based on this data. Include:
+1. Direct answer to the question
+2. Key metrics with formatted numbers
+3. Any relevant insights or patterns
+4. Data quality caveats if relevant
+
+Keep the response concise but comprehensive.
 """
 
 
+@lru_cache(maxsize=1)
+def _cached_system_prompt(data_version):
+    """Build the system prompt once per data version (keeps the prompt prefix cacheable)."""
+    return get_system_prompt()
+
+
+SECTORS = ['mining', 'energy', 'renewables', 'powerline', 'urban', 'infrastructure', 'agriculture']
+
+# Keyword -> group used to route a question and pick its sector/quarter filters
+_KEYWORD_GROUPS = {
+    **dict.fromkeys(['work order', 'project', 'execution', 'billing', 'billed', 'revenue', 'collected'], "work_orders"),
+    **dict.fromkeys(['deal', 'pipeline', 'sales', 'prospect', 'opportunity', 'stage'], "deals"),
+    **dict.fromkeys(['overall', 'business', 'company', 'everything', 'summary', 'leadership', 'update'], "both"),
+    **dict.fromkeys(SECTORS, "sector"),
+    **dict.fromkeys(['quarter', 'this quarter', 'current quarter', 'q1', 'q2', 'q3', 'q4'], "quarter"),
+    **dict.fromkeys([str(y) for y in range(2024, 2028)], "year"),
+}
+
+# Single compiled scanner for all keywords. The lookahead reports overlapping
+# matches, so results are identical to a plain `term in question` check per term.
+_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(term) for term in sorted(_KEYWORD_GROUPS, key=len, reverse=True)) + "))"
+)
+
+
 def analyze_data_for_question(question):
     """Analyze the relevant data based on the question and return structured insights."""
     question_lower = question.lower()
@@ -76,17 +128,14 @@ def analyze_data_for_question(question):
         "caveats": []
     }
     
-    # Get base data
-    work_orders = get_work_orders_df()
-    deals = get_deals_df()
+    # Find every routing/sector keyword in one pass over the question
+    keywords = set(_KEYWORD_RE.findall(question_lower))
+    keyword_groups = {_KEYWORD_GROUPS[term] for term in keywords}
     
     # Determine which data sources are relevant
-    needs_work_orders = any(term in question_lower for term in 
-                           ['work order', 'project', 'execution', 'billing', 'billed', 'revenue', 'collected'])
-    needs_deals = any(term in question_lower for term in 
-                     ['deal', 'pipeline', 'sales', 'prospect', 'opportunity', 'stage'])
-    needs_both = any(term in question_lower for term in 
-                    ['overall', 'business', 'company', 'everything', 'summary', 'leadership', 'update'])
+    needs_work_orders = "work_orders" in keyword_groups
+    needs_deals = "deals" in keyword_groups
+    needs_both = "both" in keyword_groups
     
     # Default to both if unclear
     if not needs_work_orders and not needs_deals:
@@ -96,48 +145,43 @@ def analyze_data_for_question(question):
         needs_work_orders = True
         needs_deals = True
     
+    # Get base data (only the boards this question needs)
+    if needs_work_orders and needs_deals:
+        load_all_boards()
+    work_orders = get_work_orders_df() if needs_work_orders else None
+    deals = get_deals_df() if needs_deals else None
+    
     # Check for sector filter
-    sectors = ['mining', 'energy', 'renewables', 'powerline', 'urban', 'infrastructure', 'agriculture']
-    sector_filter = None
-    for sector in sectors:
-        if sector in question_lower:
-            sector_filter = sector
-            break
+    sector_filter = next((sector for sector in SECTORS if sector in keywords), None)
     
     # Energy often means renewables
-    if 'energy' in question_lower:
+    if 'energy' in keywords:
         sector_filter = 'renewables'
     
+    # Track whether each board is still the full board (full-board breakdowns are precomputed)
+    work_orders_filtered = False
+    deals_filtered = False
+    
     # Apply sector filter
     if sector_filter:
         if needs_work_orders:
             work_orders = filter_by_sector(work_orders, sector_filter)
+            work_orders_filtered = True
         if needs_deals:
             deals = filter_by_sector(deals, sector_filter)
+            deals_filtered = True
         results["metrics"]["sector_filter"] = sector_filter
     
     # Check for time filter (quarterly)
-    if 'quarter' in question_lower or 'q1' in question_lower or 'q2' in question_lower or 'q3' in question_lower or 'q4' in question_lower:
+    if "quarter" in keyword_groups:
         # Extract quarter if specified
-        quarter = None
-        year = 2026  # Current year
-        
-        if 'this quarter' in question_lower or 'current quarter' in question_lower:
+        if 'this quarter' in keywords or 'current quarter' in keywords:
             quarter = 1  # Feb 2026 is Q1
-        elif 'q1' in question_lower:
-            quarter = 1
-        elif 'q2' in question_lower:
-            quarter = 2
-        elif 'q3' in question_lower:
-            quarter = 3
-        elif 'q4' in question_lower:
-            quarter = 4
+        else:
+            quarter = next((q for q in range(1, 5) if f"q{q}" in keywords), None)
         
-        # Check for year
-        for y in range(2024, 2028):
-            if str(y) in question_lower:
-                year = y
-                break
+        # Check for year (defaults to the current year)
+        year = next((y for y in range(2024, 2028) if str(y) in keywords), 2026)
         
         if quarter:
             quarterly_data = get_quarterly_data(year, quarter)
@@ -145,8 +189,10 @@ def analyze_data_for_question(question):
             
             if needs_work_orders and not quarterly_data["work_orders"].empty:
                 work_orders = quarterly_data["work_orders"]
+                work_orders_filtered = True
             if needs_deals and not quarterly_data["deals"].empty:
                 deals = quarterly_data["deals"]
+                deals_filtered = True
     
     # Analyze Work Orders
     if needs_work_orders:
@@ -156,28 +202,35 @@ def analyze_data_for_question(question):
             "total_work_orders": len(work_orders),
         }
         
-        # Revenue metrics
+        # Revenue, billing and (for filtered data) breakdowns in a single pass over the cached arrays
         revenue_col = "Amount in Rupees (Excl of GST) (Masked)"
-        if revenue_col in work_orders.columns:
-            values = pd.to_numeric(work_orders[revenue_col], errors='coerce').dropna()
-            if len(values) > 0:
-                wo_metrics["total_revenue"] = float(values.sum())
-                wo_metrics["avg_order_value"] = float(values.mean())
+        billed_col = "Billed Value in Rupees (Excl of GST.) (Masked)"
+        totals, breakdowns = aggregate_board(
+            "work_orders", work_orders,
+            value_columns=[revenue_col, billed_col],
+            category_columns=BREAKDOWN_COLUMNS["work_orders"] if work_orders_filtered else ()
+        )
+        if not work_orders_filtered:
+            breakdowns = get_precomputed_breakdowns("work_orders")
+        
+        # Revenue metrics
+        revenue_total, revenue_count = totals.get(revenue_col, (0.0, 0))
+        if revenue_count > 0:
+            wo_metrics["total_revenue"] = revenue_total
+            wo_metrics["avg_order_value"] = revenue_total / revenue_count
         
         # Billed metrics
-        billed_col = "Billed Value in Rupees (Excl of GST.) (Masked)"
-        if billed_col in work_orders.columns:
-            values = pd.to_numeric(work_orders[billed_col], errors='coerce').dropna()
-            if len(values) > 0:
-                wo_metrics["total_billed"] = float(values.sum())
+        billed_total, billed_count = totals.get(billed_col, (0.0, 0))
+        if billed_count > 0:
+            wo_metrics["total_billed"] = billed_total
         
         # Status breakdown
-        if "Execution Status" in work_orders.columns:
-            wo_metrics["status_breakdown"] = work_orders["Execution Status"].value_counts().to_dict()
+        if "Execution Status" in breakdowns:
+            wo_metrics["status_breakdown"] = breakdowns["Execution Status"]
         
         # Sector breakdown
-        if "Sector" in work_orders.columns:
-            wo_metrics["sector_breakdown"] = work_orders["Sector"].value_counts().to_dict()
+        if "Sector" in breakdowns:
+            wo_metrics["sector_breakdown"] = breakdowns["Sector"]
         
         results["metrics"]["work_orders"] = wo_metrics
     
@@ -189,27 +242,35 @@ def analyze_data_for_question(question):
             "total_deals": len(deals),
         }
         
-        # Deal value
+        # Deal value and (for filtered data) breakdowns in a single pass over the cached arrays
         value_col = "Masked Deal value"
-        if value_col in deals.columns:
-            values = pd.to_numeric(deals[value_col], errors='coerce').dropna()
-            if len(values) > 0:
-                deals_metrics["total_pipeline_value"] = float(values.sum())
-                deals_metrics["avg_deal_value"] = float(values.mean())
-                deals_metrics["deals_with_value"] = len(values)
+        sector_col = "Sector/service"
+        totals, breakdowns = aggregate_board(
+            "deals", deals,
+            value_columns=[value_col],
+            category_columns=BREAKDOWN_COLUMNS["deals"] if deals_filtered else ()
+        )
+        if not deals_filtered:
+            breakdowns = get_precomputed_breakdowns("deals")
+        
+        # Deal value
+        value_total, value_count = totals.get(value_col, (0.0, 0))
+        if value_count > 0:
+            deals_metrics["total_pipeline_value"] = value_total
+            deals_metrics["avg_deal_value"] = value_total / value_count
+            deals_metrics["deals_with_value"] = value_count
         
         # Stage breakdown
-        if "Deal Stage" in deals.columns:
-            deals_metrics["stage_breakdown"] = deals["Deal Stage"].value_counts().to_dict()
+        if "Deal Stage" in breakdowns:
+            deals_metrics["stage_breakdown"] = breakdowns["Deal Stage"]
         
         # Status breakdown
-        if "Deal Status" in deals.columns:
-            deals_metrics["status_breakdown"] = deals["Deal Status"].value_counts().to_dict()
+        if "Deal Status" in breakdowns:
+            deals_metrics["status_breakdown"] = breakdowns["Deal Status"]
         
         # Sector breakdown
-        sector_col = "Sector/service"
-        if sector_col in deals.columns:
-            deals_metrics["sector_breakdown"] = deals[sector_col].value_counts().to_dict()
+        if sector_col in breakdowns:
+            deals_metrics["sector_breakdown"] = breakdowns[sector_col]
         
         results["metrics"]["deals"] = deals_metrics
     
@@ -217,10 +278,10 @@ def analyze_data_for_question(question):
     if needs_work_orders:
         results["caveats"].append("Revenue data uses 'Amount in Rupees (Excl of GST)' column")
     if needs_deals:
-        deals_full = get_deals_df()
-        missing_value = pd.to_numeric(deals_full["Masked Deal value"], errors='coerce').isna().sum()
+        deal_values = get_numeric_column("deals", "Masked Deal value")
+        missing_value = deal_values.isna().sum()
         if missing_value > 0:
-            results["caveats"].append(f"Pipeline value: {missing_value} deals ({round(missing_value/len(deals_full)*100)}%) have no value recorded")
+            results["caveats"].append(f"Pipeline value: {missing_value} deals ({round(missing_value/len(deal_values)*100)}%) have no value recorded")
     
     return results
 
@@ -240,6 +301,7 @@ def format_number(value, prefix="₹"):
 
 def generate_leadership_update():
     """Generate a comprehensive leadership update."""
+    load_all_boards()
     work_orders = get_work_orders_df()
     deals = get_deals_df()
     
@@ -257,10 +319,17 @@ def generate_leadership_update():
     revenue_col = "Amount in Rupees (Excl of GST) (Masked)"
     billed_col = "Billed Value in Rupees (Excl of GST.) (Masked)"
     
-    total_revenue = pd.to_numeric(work_orders[revenue_col], errors='coerce').sum()
-    total_billed = pd.to_numeric(work_orders[billed_col], errors='coerce').sum()
+    total_revenue = get_numeric_column("work_orders", revenue_col).sum()
+    total_billed = get_numeric_column("work_orders", billed_col).sum()
+    unbilled = total_revenue - total_billed
+    
+    deal_values = get_numeric_column("deals", "Masked Deal value")
+    deal_value = deal_values.sum()
     
-    status_counts = work_orders["Execution Status"].value_counts().to_dict()
+    wo_breakdowns = get_precomputed_breakdowns("work_orders")
+    deal_breakdowns = get_precomputed_breakdowns("deals")
+    
+    status_counts = wo_breakdowns["Execution Status"]
     completed = status_counts.get("Completed", 0)
     ongoing = status_counts.get("Ongoing", 0) + status_counts.get("Executed until current month", 0)
     
@@ -274,9 +343,8 @@ def generate_leadership_update():
     }
     
     # Pipeline Summary
-    deal_value = pd.to_numeric(deals["Masked Deal value"], errors='coerce').sum()
-    stage_counts = deals["Deal Stage"].value_counts().to_dict()
-    status_counts = deals["Deal Status"].value_counts().to_dict()
+    stage_counts = deal_breakdowns["Deal Stage"]
+    status_counts = deal_breakdowns["Deal Status"]
     
     won_deals = status_counts.get("Won", 0)
     lost_deals = status_counts.get("Lost", 0)
@@ -293,95 +361,216 @@ def generate_leadership_update():
     }
     
     # Sector Insights
-    wo_sectors = work_orders["Sector"].value_counts().to_dict()
-    deal_sectors = deals["Sector/service"].value_counts().to_dict()
+    wo_sectors = wo_breakdowns["Sector"]
+    deal_sectors = deal_breakdowns["Sector/service"]
     
     update["sector_insights"] = {
         "work_orders_by_sector": wo_sectors,
         "deals_by_sector": deal_sectors,
-        "top_sector_work_orders": max(wo_sectors, key=wo_sectors.get) if wo_sectors else "N/A",
-        "top_sector_deals": max(deal_sectors, key=deal_sectors.get) if deal_sectors else "N/A"
+        # Breakdowns are ordered most common first, so the top sector is the first key
+        "top_sector_work_orders": next(iter(wo_sectors), "N/A"),
+        "top_sector_deals": next(iter(deal_sectors), "N/A")
     }
     
     # Concerns
-    unbilled = total_revenue - total_billed
     if unbilled > 0:
         update["concerns"].append(f"Unbilled amount: {format_number(unbilled)} pending billing")
     
-    missing_values = len(deals) - len(pd.to_numeric(deals["Masked Deal value"], errors='coerce').dropna())
+    missing_values = int(deal_values.isna().sum())
     if missing_values > len(deals) * 0.3:
         update["concerns"].append(f"{missing_values} deals ({round(missing_values/len(deals)*100)}%) missing deal value - data quality issue")
     
     return update
 
 
-def answer_question(question, conversation_history=None):
-    """Answer a business intelligence question using AI."""
+def analyze(question):
+    """Run a single analysis pass for a question: a leadership update or a targeted analysis."""
+    question_lower = question.lower()
+    
+    # Check for leadership update request
+    is_leadership_update = any(term in question_lower for term in 
+                              ['leadership', 'update', 'summary', 'report', 'board meeting', 'executive'])
+    
+    if is_leadership_update:
+        return {"title": "Leadership Update Data", "data": generate_leadership_update(), "leadership": True}
+    return {"title": "Data Analysis Results", "data": analyze_data_for_question(question), "leadership": False}
+
+
+def _choose_model(analysis):
+    """Pick the model and token budget (GPT-4o only for leadership updates and filtered cross-board questions)."""
+    # Both boards plus a sector/quarter filter means 3+ metric sections
+    if analysis["leadership"] or len(analysis["data"]["metrics"]) >= 3:
+        return "gpt-4o", 1500
+    return "gpt-4o-mini", 600
+
+
+# "How many deals/work orders (are open/won/...)?" - answered straight from the analysis
+_COUNT_LOOKUP_RE = re.compile(
+    r"^how many (deals|work orders)(?: are there| do we have| are (open|won|lost|completed|ongoing))?\s*\??$"
+)
+
+
+def _lookup_answer(question, analysis):
+    """Answer a pure count lookup from the analysis without calling OpenAI (None if not a lookup)."""
+    match = _COUNT_LOOKUP_RE.match(question)
+    if not match or analysis["leadership"]:
+        return None
+    
+    board, status = match.groups()
+    if board == "deals":
+        metrics = analysis["data"]["metrics"].get("deals", {})
+        total = metrics.get("total_deals")
+    else:
+        metrics = analysis["data"]["metrics"].get("work_orders", {})
+        total = metrics.get("total_work_orders")
+    if total is None:
+        return None
+    
+    if status is None:
+        return f"There are **{total:,}** {board} in total."
+    
+    status_breakdown = metrics.get("status_breakdown", {})
+    if status.title() not in status_breakdown:
+        return None
+    count = status_breakdown[status.title()]
+    return f"**{count:,}** of {total:,} {board} are {status}."
+
+
+def _build_messages(question, data_version, history, analysis):
+    """Build the chat messages for a question from its analysis payload."""
+    # Compact JSON - indentation only adds prompt tokens
+    data_context = f"""
+{analysis["title"]}:
+{json.dumps(analysis["data"], separators=(",", ":"), default=str)}
+"""
+    
+    # Build messages - static system prompt first so the shared prefix is cacheable
+    messages = [
+        {"role": "system", "content": _cached_system_prompt(data_version)},
+    ]
+    
+    # Add conversation history
+    for role, content in history:
+        messages.append({"role": role, "content": content})
+    
+    # Add the current question with data context last (the only per-turn content)
+    user_message = f"""Question: {question}
+
+{data_context}"""
+
+    messages.append({"role": "user", "content": user_message})
+    
+    return messages
+
+
+def _error_message(error):
+    """Turn an exception into a user-facing error message."""
+    error_msg = str(error)
+    if "api_key" in error_msg.lower():
+        return "Error: OpenAI API key is invalid or missing. Please check your configuration."
+    return f"I encountered an error while processing your question: {error_msg}\n\nPlease try rephrasing your question or check the data connection."
+
+
+def _get_cached_response(key):
+    """Get a cached answer (None if absent), marking it most recently used."""
+    with _response_cache_lock:
+        answer = _response_cache.get(key)
+        if answer is not None:
+            _response_cache.move_to_end(key)
+        return answer
+
+
+def _cache_response(key, answer):
+    """Store an answer, evicting the least recently used ones beyond the cache size."""
+    with _response_cache_lock:
+        _response_cache[key] = answer
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > _RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+
+def _response_cache_key(question, conversation_history):
+    """Key a question's answer on (normalized question, data version, recent history)."""
+    history = tuple(
+        (msg["role"], msg["content"])
+        for msg in conversation_history[-6:]  # Keep last 6 messages for context
+    )
+    return question.lower().strip(), get_data_version(), history
+
+
+def prefetch_analysis(question, conversation_history=None):
+    """Start analyzing the data for a question in the background and return a Future.
+
+    Returns None when the answer is already cached, since no analysis will be needed.
+    """
+    cache_key = _response_cache_key(question, conversation_history or [])
+    if _get_cached_response(cache_key) is not None:
+        return None
+    
+    def run():
+        _cached_system_prompt(cache_key[1])
+        return analyze(cache_key[0])
+    
+    return _executor.submit(run)
+
+
+def answer_question_stream(question, conversation_history=None, analysis_future=None):
+    """Answer a business intelligence question, yielding the response as it is generated."""
     
     if conversation_history is None:
         conversation_history = []
     
     try:
-        # Get data analysis
-        data_analysis = analyze_data_for_question(question)
+        # Repeated questions (e.g. the example buttons) are served from the response cache;
+        # the normalized form only keys the cache and routing, the model sees the question as typed
+        cache_key = _response_cache_key(question, conversation_history)
+        question_norm, data_version, history = cache_key
+        cached = _get_cached_response(cache_key)
+        if cached is not None:
+            yield cached
+            return
         
-        # Check for leadership update request
-        is_leadership_update = any(term in question.lower() for term in 
-                                  ['leadership', 'update', 'summary', 'report', 'board meeting', 'executive'])
-        
-        if is_leadership_update:
-            leadership_data = generate_leadership_update()
-            data_context = f"""
-Leadership Update Data:
-{json.dumps(leadership_data, indent=2)}
-"""
+        # Get data analysis (possibly already computed in the background)
+        if analysis_future is not None:
+            analysis = analysis_future.result()
         else:
-            data_context = f"""
-Data Analysis Results:
-{json.dumps(data_analysis, indent=2, default=str)}
-"""
+            analysis = analyze(question_norm)
         
-        # Build messages
-        messages = [
-            {"role": "system", "content": get_system_prompt()},
-        ]
+        # Pure lookups are answered from the analysis directly
+        answer = _lookup_answer(question_norm, analysis)
+        if answer is not None:
+            _cache_response(cache_key, answer)
+            yield answer
+            return
         
-        # Add conversation history
-        for msg in conversation_history[-6:]:  # Keep last 6 messages for context
-            messages.append(msg)
+        messages = _build_messages(question, data_version, history, analysis)
+        model, max_tokens = _choose_model(analysis)
         
-        # Add the current question with data context
-        user_message = f"""Question: {question}
-
-{data_context}
-
-Please provide a clear, insightful answer based on this data. Include:
-1. Direct answer to the question
-2. Key metrics with formatted numbers
-3. Any relevant insights or patterns
-4. Data quality caveats if relevant
-
-Keep the response concise but comprehensive."""
-
-        messages.append({"role": "user", "content": user_message})
-        
-        # Call OpenAI
-        response = client.chat.completions.create(
-            model="gpt-4o",
+        # Call OpenAI, streaming tokens as they arrive
+        stream = client.chat.completions.create(
+            model=model,
             messages=messages,
             temperature=0.7,
-            max_tokens=1500
+            max_tokens=max_tokens,
+            stream=True
         )
         
-        answer = response.choices[0].message.content
+        parts = []
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
         
-        return answer
+        _cache_response(cache_key, "".join(parts))
         
     except Exception as e:
-        error_msg = str(e)
-        if "api_key" in error_msg.lower():
-            return "Error: OpenAI API key is invalid or missing. Please check your configuration."
-        return f"I encountered an error while processing your question: {error_msg}\n\nPlease try rephrasing your question or check the data connection."
+        yield _error_message(e)
+
+
+def answer_question(question, conversation_history=None):
+    """Answer a business intelligence question using AI."""
+    return "".join(answer_question_stream(question, conversation_history))
 
 
 def get_clarifying_questions(question):
@@ -1,8 +1,9 @@
 import streamlit as st
-from agent import answer_question, generate_leadership_update
-from query_engine import get_data_summary, clear_cache, get_work_orders_df, get_deals_df
+from agent import answer_question_stream, prefetch_analysis, generate_leadership_update
+from query_engine import get_data_summary, clear_cache, get_preview
 import pandas as pd
 import json
+from itertools import chain
 
 # Page configuration
 st.set_page_config(
@@ -60,8 +61,45 @@ if "messages" not in st.session_state:
     st.session_state.messages = []
 if "data_loaded" not in st.session_state:
     st.session_state.data_loaded = False
-if "pending_question" not in st.session_state:
-    st.session_state.pending_question = None
+
+# Question clicked on a button in this run: (question, analysis future).
+# Answered further down in the same run, so button clicks don't need an extra st.rerun().
+queued_question = None
+
+
+def queue_question(question):
+    """Queue a question for this run, starting its data analysis in the background."""
+    global queued_question
+    queued_question = (question, prefetch_analysis(question, st.session_state.messages))
+
+
+def handle_question(prompt, analysis_future=None):
+    """Show a question in the chat and stream the answer in place."""
+    # Display user message
+    with st.chat_message("user"):
+        st.markdown(prompt)
+    
+    # Add to history
+    st.session_state.messages.append({"role": "user", "content": prompt})
+    
+    # Generate and display assistant response
+    with st.chat_message("assistant"):
+        try:
+            conversation_history = [
+                {"role": msg["role"], "content": msg["content"]} 
+                for msg in st.session_state.messages[:-1][-6:]
+            ]
+            stream = answer_question_stream(prompt, conversation_history, analysis_future)
+            # The wait for the data analysis and the first token happens before anything renders
+            with st.spinner("Analyzing your data..."):
+                first_chunk = next(stream, "")
+            response = st.write_stream(chain([first_chunk], stream))
+            st.session_state.messages.append({"role": "assistant", "content": response})
+        except Exception as e:
+            error_msg = f"I encountered an error: {str(e)}"
+            st.error(error_msg)
+            st.session_state.messages.append({"role": "assistant", "content": error_msg})
+
 
 # Sidebar
 with st.sidebar:
@@ -121,8 +159,7 @@ with st.sidebar:
     
     for q in example_questions:
         if st.button(q, key=f"example_{q}", use_container_width=True):
-            st.session_state.pending_question = q
-            st.rerun()
+            queue_question(q)
 
 # Main content
 st.markdown('<p class="main-header">🤖 Monday.com BI Agent</p>', unsafe_allow_html=True)
@@ -132,16 +169,13 @@ st.markdown('<p class="sub-header">Ask business intelligence questions about you
 col1, col2, col3 = st.columns(3)
 with col1:
     if st.button("📈 Pipeline Overview", use_container_width=True):
-        st.session_state.pending_question = "Give me an overview of the current pipeline"
-        st.rerun()
+        queue_question("Give me an overview of the current pipeline")
 with col2:
     if st.button("💰 Revenue Summary", use_container_width=True):
-        st.session_state.pending_question = "What's our total revenue and billing status?"
-        st.rerun()
+        queue_question("What's our total revenue and billing status?")
 with col3:
     if st.button("📋 Leadership Brief", use_container_width=True):
-        st.session_state.pending_question = "Prepare a leadership update with key metrics"
-        st.rerun()
+        queue_question("Prepare a leadership update with key metrics")
 
 st.markdown("---")
 
@@ -150,58 +184,13 @@ for message in st.session_state.messages:
     with st.chat_message(message["role"]):
         st.markdown(message["content"])
 
-# Process pending question from buttons
-if st.session_state.pending_question:
-    prompt = st.session_state.pending_question
-    st.session_state.pending_question = None
-    
-    # Display user message
-    with st.chat_message("user"):
-        st.markdown(prompt)
-    
-    # Add to history
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    
-    # Generate and display response
-    with st.chat_message("assistant"):
-        with st.spinner("Analyzing data..."):
-            try:
-                conversation_history = [
-                    {"role": msg["role"], "content": msg["content"]} 
-                    for msg in st.session_state.messages[:-1][-6:]
-                ]
-                response = answer_question(prompt, conversation_history)
-                st.markdown(response)
-                st.session_state.messages.append({"role": "assistant", "content": response})
-            except Exception as e:
-                error_msg = f"I encountered an error: {str(e)}"
-                st.error(error_msg)
-                st.session_state.messages.append({"role": "assistant", "content": error_msg})
+# Answer a question from the buttons
+if queued_question:
+    handle_question(*queued_question)
 
 # Chat input
 if prompt := st.chat_input("Ask a business question..."):
-    # Display user message
-    with st.chat_message("user"):
-        st.markdown(prompt)
-    
-    # Add to history
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    
-    # Generate and display assistant response
-    with st.chat_message("assistant"):
-        with st.spinner("Analyzing your data..."):
-            try:
-                conversation_history = [
-                    {"role": msg["role"], "content": msg["content"]} 
-                    for msg in st.session_state.messages[:-1][-6:]
-                ]
-                response = answer_question(prompt, conversation_history)
-                st.markdown(response)
-                st.session_state.messages.append({"role": "assistant", "content": response})
-            except Exception as e:
-                error_msg = f"I encountered an error: {str(e)}"
-                st.error(error_msg)
-                st.session_state.messages.append({"role": "assistant", "content": error_msg})
+    handle_question(prompt)
 
 # Clear chat button at the bottom
 if st.session_state.messages:
@@ -213,35 +202,27 @@ if st.session_state.messages:
 st.markdown("---")
 st.markdown("### 📊 Data Explorer")
 
-tab1, tab2, tab3 = st.tabs(["Work Orders Preview", "Deals Preview", "Data Quality"])
 
-with tab1:
+@st.fragment
+def render_preview(board, label):
+    """Render the first rows of a board (preview is cached until the data is refreshed)."""
     try:
-        wo_df = get_work_orders_df()
+        preview, total_rows = get_preview(board)
         st.dataframe(
-            wo_df.head(10),
+            preview,
             use_container_width=True,
             hide_index=True
         )
-        st.caption(f"Showing 10 of {len(wo_df)} work orders")
+        st.caption(f"Showing {len(preview)} of {total_rows} {label}")
     except Exception as e:
-        st.error(f"Error loading work orders: {e}")
+        st.error(f"Error loading {label}: {e}")
 
-with tab2:
-    try:
-        deals_df = get_deals_df()
-        st.dataframe(
-            deals_df.head(10),
-            use_container_width=True,
-            hide_index=True
-        )
-        st.caption(f"Showing 10 of {len(deals_df)} deals")
-    except Exception as e:
-        st.error(f"Error loading deals: {e}")
 
-with tab3:
+@st.fragment
+def render_data_quality():
+    """Render data quality for both boards from the summary loaded in the sidebar."""
     try:
-        summary = get_data_summary()
+        summary = st.session_state.summary if st.session_state.data_loaded else get_data_summary()
         
         col1, col2 = st.columns(2)
         
@@ -269,3 +250,15 @@ with tab3:
                     
     except Exception as e:
         st.error(f"Error loading data quality: {e}")
+
+
+tab1, tab2, tab3 = st.tabs(["Work Orders Preview", "Deals Preview", "Data Quality"])
+
+with tab1:
+    render_preview("work_orders", "work orders")
+
+with tab2:
+    render_preview("deals", "deals")
+
+with tab3:
+    render_data_quality()
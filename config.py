@@ -3,19 +3,43 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-# Try Streamlit secrets first (for cloud deployment), then fall back to .env
-def get_secret(key):
-    """Get secret from Streamlit secrets or environment variable."""
+_KEYS = (
+    "MONDAY_API_TOKEN",
+    "WORK_ORDERS_BOARD_ID",
+    "DEALS_BOARD_ID",
+    "OPENAI_API_KEY",
+    "HF_API_TOKEN",
+)
+
+
+def _load_streamlit_secrets():
+    """Read Streamlit secrets once (for cloud deployment); empty if unavailable."""
     try:
         import streamlit as st
-        if hasattr(st, 'secrets') and key in st.secrets:
-            return st.secrets[key]
+        if hasattr(st, 'secrets'):
+            return dict(st.secrets)
     except Exception:
         pass
+    return {}
+
+
+_secrets = _load_streamlit_secrets()
+
+
+# Try Streamlit secrets first (for cloud deployment), then fall back to .env
+def get_secret(key):
+    """Get secret from Streamlit secrets or environment variable."""
+    if key in _secrets:
+        return _secrets[key]
     return os.getenv(key)
 
-MONDAY_API_TOKEN = get_secret("MONDAY_API_TOKEN")
-WORK_ORDERS_BOARD_ID = get_secret("WORK_ORDERS_BOARD_ID")
-DEALS_BOARD_ID = get_secret("DEALS_BOARD_ID")
-OPENAI_API_KEY = get_secret("OPENAI_API_KEY")
-HF_API_TOKEN = get_secret("HF_API_TOKEN")
+
+# Resolved once at import; attribute access goes through the module-level __getattr__
+_values = {key: get_secret(key) for key in _KEYS}
+
+
+def __getattr__(name):
+    """Look up configuration values lazily (PEP 562)."""
+    if name in _values:
+        return _values[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
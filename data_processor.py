@@ -1,51 +1,100 @@
+import numpy as np
 import pandas as pd
 import re
 from datetime import datetime
 
 
+# Common date formats to try, in order
+_DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%d-%m-%Y",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+    "%Y/%m/%d",
+    "%d %b %Y",
+    "%B %d, %Y",
+)
+
+# Copy-on-Write makes DataFrame copies lazy, so the cleaning pipeline and the
+# query cache can hand out frames without defensive deep copies.
+# (Always enabled from pandas 3.0, where the option is deprecated.)
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# Currency symbols, thousands separators and whitespace stripped from numeric values
+_CURRENCY_RE = re.compile(r'[₹$€£,\s]')
+
+# Arrow-backed strings hash, compare and count in native code instead of per-PyObject.
+# pyarrow ships with streamlit; pandas 3 already uses it for its default str dtype.
+try:
+    import pyarrow  # noqa: F401
+    _ARROW_STRINGS = pd.StringDtype("pyarrow")
+except ImportError:
+    _ARROW_STRINGS = None
+
+
 def monday_json_to_dataframe(data):
     """Convert Monday.com JSON response to a pandas DataFrame with proper column names."""
     board = data["data"]["boards"][0]
-    items = board["items_page"]["items"]
-    
+    return board_items_to_dataframe(board, board["items_page"]["items"])
+
+
+def board_items_to_dataframe(board, items):
+    """Build a DataFrame from board metadata and an iterable of items (e.g. streamed by monday_client.open_board_items)."""
     # Build column ID to title mapping
-    columns = board.get("columns", [])
-    column_map = {col["id"]: col["title"] for col in columns}
+    column_map = {col["id"]: col["title"] for col in board.get("columns", [])}
     
-    records = []
+    # Build column-major while items stream in: one list per column, padded with None
+    # for rows that lack the column (or that came before it first appeared)
+    names = []
+    columns_data = {}
     
-    for item in items:
-        row = {"Item Name": item["name"]}
-        
+    for row, item in enumerate(items):
+        names.append(item["name"])
         for col in item["column_values"]:
             column_id = col["id"]
             # Use human-readable column title if available
             column_name = column_map.get(column_id, column_id)
-            row[column_name] = col["text"]
-        
-        records.append(row)
+            values = columns_data.get(column_name)
+            if values is None:
+                values = columns_data[column_name] = []
+            if len(values) > row:
+                values[row] = col["text"]
+            else:
+                values.extend([None] * (row - len(values)))
+                values.append(col["text"])
+    
+    for values in columns_data.values():
+        values.extend([None] * (len(names) - len(values)))
     
-    return pd.DataFrame(records)
+    return pd.DataFrame({"Item Name": names, **columns_data})
 
 
 def clean_dataframe(df):
     """Clean and normalize DataFrame values."""
-    df = df.copy()
-    
-    # Fill NaN with empty string
+    # Fill NaN with empty string (returns a new frame, so the input is untouched)
     df = df.fillna("")
     
-    # Normalize text columns - strip whitespace
-    for col in df.columns:
-        if df[col].dtype == object:
-            df[col] = df[col].astype(str).str.strip()
+    # Normalize text columns - strip whitespace, assigning all text columns in one block
+    text_cols = df.select_dtypes(include=["object", "string"]).columns
+    if len(text_cols) > 0:
+        df[text_cols] = df[text_cols].apply(_strip_text)
     
     return df
 
 
+def _strip_text(series):
+    """Strip whitespace from a text column (converting to str only if it holds non-strings)."""
+    if pd.api.types.infer_dtype(series, skipna=False) != "string":
+        series = series.astype(str)
+    if _ARROW_STRINGS is not None and series.dtype == object:
+        series = series.astype(_ARROW_STRINGS)
+    return series.str.strip()
+
+
 def normalize_dates(df, date_columns=None):
     """Normalize date columns to consistent format."""
-    df = df.copy()
+    df = df.copy(deep=False)  # lazy under Copy-on-Write
     
     if date_columns is None:
         # Try to detect date columns
@@ -56,28 +105,46 @@ def normalize_dates(df, date_columns=None):
     
     for col in date_columns:
         if col in df.columns:
-            df[col] = df[col].apply(parse_date)
+            df[col] = parse_date_series(df[col])
     
     return df
 
 
+def parse_date_series(series):
+    """Vectorized parse_date: parse a Series of mixed-format dates to ISO format."""
+    # Empty values become None and values no format matches are kept as-is, like parse_date
+    empty = (series.isna() | series.isin(["", 0])).to_numpy()
+    
+    # Date columns repeat heavily, so each distinct string is parsed only once
+    codes, uniques = pd.factorize(series.astype(str).str.strip())
+    unique_text = np.asarray(uniques, dtype=object)
+    unique_parsed = np.full(len(unique_text), None, dtype=object)
+    pending = np.ones(len(unique_text), dtype=bool)
+    
+    # Try each format with pandas' C parser on the values still unparsed
+    for fmt in _DATE_FORMATS:
+        rows = np.flatnonzero(pending)
+        if rows.size == 0:
+            break
+        parsed = pd.to_datetime(pd.Series(unique_text[rows], dtype=object), format=fmt, errors='coerce')
+        ok = parsed.notna().to_numpy()
+        unique_parsed[rows[ok]] = parsed[ok].dt.strftime("%Y-%m-%d").to_numpy()
+        pending[rows[ok]] = False
+    
+    parsed = np.where(codes >= 0, unique_parsed[codes], None)
+    result = series.to_numpy(dtype=object, copy=True)
+    matched = pd.notna(parsed)
+    result[matched] = parsed[matched]
+    result[empty] = None
+    return pd.Series(result, index=series.index, name=series.name, dtype=object)
+
+
 def parse_date(value):
     """Parse various date formats to ISO format."""
     if not value or pd.isna(value) or value == "":
         return None
     
-    # Common date formats to try
-    formats = [
-        "%Y-%m-%d",
-        "%d-%m-%Y",
-        "%m/%d/%Y",
-        "%d/%m/%Y",
-        "%Y/%m/%d",
-        "%d %b %Y",
-        "%B %d, %Y",
-    ]
-    
-    for fmt in formats:
+    for fmt in _DATE_FORMATS:
         try:
             return datetime.strptime(str(value).strip(), fmt).strftime("%Y-%m-%d")
         except ValueError:
@@ -92,7 +159,7 @@ def normalize_currency(value):
         return None
     
     # Remove currency symbols and commas
-    cleaned = re.sub(r'[₹$€£,\s]', '', str(value))
+    cleaned = _CURRENCY_RE.sub('', str(value))
     
     try:
         return float(cleaned)
@@ -102,7 +169,7 @@ def normalize_currency(value):
 
 def normalize_numeric_columns(df, numeric_columns=None):
     """Convert numeric columns to float, handling messy data."""
-    df = df.copy()
+    df = df.copy(deep=False)  # lazy under Copy-on-Write
     
     if numeric_columns is None:
         # Auto-detect numeric columns based on content
@@ -114,7 +181,9 @@ def normalize_numeric_columns(df, numeric_columns=None):
     
     for col in numeric_columns:
         if col in df.columns:
-            df[col] = df[col].apply(normalize_currency)
+            # One regex pass over the column, then pandas' C numeric parser (like normalize_currency per cell)
+            cleaned = df[col].astype(str).str.replace(_CURRENCY_RE, '', regex=True)
+            df[col] = pd.to_numeric(cleaned, errors='coerce').astype("float64")
     
     return df
 
@@ -128,8 +197,10 @@ def get_data_quality_report(df):
         "empty_rows": 0,
     }
     
-    for col in df.columns:
-        missing = df[col].isna().sum() + (df[col] == "").sum()
+    # Single vectorized pass: a cell is missing if it is NaN or an empty string
+    missing_mask = df.isna() | df.eq("")
+    
+    for col, missing in missing_mask.sum(axis=0).items():
         if missing > 0:
             report["missing_data"][col] = {
                 "count": int(missing),
@@ -139,7 +210,7 @@ def get_data_quality_report(df):
     # Count rows with all empty values (except Item Name)
     data_cols = [c for c in df.columns if c != "Item Name"]
     if data_cols:
-        report["empty_rows"] = int(((df[data_cols] == "") | df[data_cols].isna()).all(axis=1).sum())
+        report["empty_rows"] = int(missing_mask[data_cols].all(axis=1).sum())
     
     return report
 
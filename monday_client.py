@@ -1,3 +1,5 @@
+import threading
+
 import requests
 from config import MONDAY_API_TOKEN
 
@@ -7,95 +9,106 @@ HEADERS = {
     "Authorization": MONDAY_API_TOKEN
 }
 
+# One keep-alive session per thread, so pagination reuses the TLS connection
+_local = threading.local()
 
-def fetch_board_items(board_id, limit=500):
-    """Fetch all items from a board with pagination support."""
-    all_items = []
-    cursor = None
-    board_name = None
-    columns = None
+
+def _post(query, variables=None, timeout=60):
+    """POST a GraphQL query to Monday.com over a pooled connection and return the decoded JSON."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+        session.headers.update(HEADERS)
     
+    payload = {"query": query}
+    if variables is not None:
+        payload["variables"] = variables
+    return session.post(API_URL, json=payload, timeout=timeout).json()
+
+
+_FIRST_PAGE_QUERY = """
+query ($board_id: [ID!]) {
+  boards(ids: $board_id) {
+    name
+    columns {
+      id
+      title
+      type
+    }
+    items_page(limit: 500) {
+      cursor
+      items {
+        name
+        column_values {
+          id
+          text
+        }
+      }
+    }
+  }
+}
+"""
+
+# Later pages only carry items; the board name and columns come with the first page
+_NEXT_PAGE_QUERY = """
+query ($cursor: String!) {
+  next_items_page(limit: 500, cursor: $cursor) {
+    cursor
+    items {
+      name
+      column_values {
+        id
+        text
+      }
+    }
+  }
+}
+"""
+
+
+def _query(query, variables):
+    """Run a GraphQL query, raising if Monday.com reports errors."""
+    data = _post(query, variables, timeout=60)
+    if "errors" in data:
+        raise Exception(f"Monday.com API error: {data['errors']}")
+    return data["data"]
+
+
+def open_board_items(board_id):
+    """Fetch a board's first page and return (board, items).
+
+    board is {"name", "columns"}, known even for an empty board; items is a generator
+    that streams every item, fetching later pages only as it is consumed.
+    """
+    first = _query(_FIRST_PAGE_QUERY, {"board_id": [board_id]})["boards"][0]
+    board = {"name": first["name"], "columns": first["columns"]}
+    return board, _iter_items(first["items_page"])
+
+
+def _iter_items(items_page):
+    # Monday cursors are opaque and each one only arrives with the previous page,
+    # so pages of one board are walked in order; concurrency belongs across boards
     while True:
-        if cursor:
-            query = """
-            query ($board_id: [ID!], $cursor: String!) {
-              boards(ids: $board_id) {
-                name
-                columns {
-                  id
-                  title
-                  type
-                }
-                items_page(limit: 500, cursor: $cursor) {
-                  cursor
-                  items {
-                    name
-                    column_values {
-                      id
-                      text
-                    }
-                  }
-                }
-              }
-            }
-            """
-            variables = {"board_id": [board_id], "cursor": cursor}
-        else:
-            query = """
-            query ($board_id: [ID!]) {
-              boards(ids: $board_id) {
-                name
-                columns {
-                  id
-                  title
-                  type
-                }
-                items_page(limit: 500) {
-                  cursor
-                  items {
-                    name
-                    column_values {
-                      id
-                      text
-                    }
-                  }
-                }
-              }
-            }
-            """
-            variables = {"board_id": [board_id]}
-
-        response = requests.post(
-            API_URL,
-            json={"query": query, "variables": variables},
-            headers=HEADERS,
-            timeout=60
-        )
-        
-        data = response.json()
-        
-        if "errors" in data:
-            raise Exception(f"Monday.com API error: {data['errors']}")
-        
-        board = data["data"]["boards"][0]
-        board_name = board["name"]
-        columns = board["columns"]
-        
-        items_page = board["items_page"]
-        all_items.extend(items_page["items"])
+        yield from items_page["items"]
         
         cursor = items_page.get("cursor")
         if not cursor:
             break
+        items_page = _query(_NEXT_PAGE_QUERY, {"cursor": cursor})["next_items_page"]
+
+
+def fetch_board_items(board_id, limit=500):
+    """Fetch all items from a board with pagination support."""
+    board, items = open_board_items(board_id)
     
     # Return in the expected format with column metadata
     return {
         "data": {
             "boards": [{
-                "name": board_name,
-                "columns": columns,
+                "name": board["name"],
+                "columns": board["columns"],
                 "items_page": {
-                    "items": all_items
+                    "items": list(items)
                 }
             }]
         }
@@ -119,14 +132,7 @@ def fetch_board_columns(board_id):
     
     variables = {"board_id": [board_id]}
     
-    response = requests.post(
-        API_URL,
-        json={"query": query, "variables": variables},
-        headers=HEADERS,
-        timeout=30
-    )
-    
-    return response.json()
+    return _post(query, variables, timeout=30)
 
 
 def test_connection():
@@ -140,11 +146,4 @@ def test_connection():
     }
     """
     
-    response = requests.post(
-        API_URL,
-        json={"query": query},
-        headers=HEADERS,
-        timeout=30
-    )
-    
-    return response.json()
+    return _post(query, timeout=30)
@@ -1,6 +1,6 @@
-from monday_client import fetch_board_items
+from monday_client import open_board_items
 from data_processor import (
-    monday_json_to_dataframe, 
+    board_items_to_dataframe,
     clean_dataframe,
     normalize_dates,
     normalize_numeric_columns,
@@ -8,41 +8,305 @@ from data_processor import (
     get_column_summary
 )
 from config import WORK_ORDERS_BOARD_ID, DEALS_BOARD_ID
+import numpy as np
 import pandas as pd
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 
 
 # Cache for dataframes to avoid repeated API calls
 _cache = {}
 
+# Cleaned boards are also kept on disk so a fresh process can skip the API round trip
+_DISK_CACHE_DIR = ".cache"
+_DISK_CACHE_TTL = 15 * 60  # seconds
+
+# Bumped whenever cached data is dropped or replaced, so derived caches can invalidate
+_data_version = 0
+
+# Guards the version check and store of derived values against a concurrent bump
+_derived_lock = threading.Lock()
+_MISSING = object()
+
+# Numeric views and factorized codes of cached columns, computed once per data version
+_numeric_cache = {}
+_codes_cache = {}
+
+# Date-sorted board rows and quarterly row positions, computed once per data version
+_dates_cache = {}
+_quarter_rows_cache = {}
+
+# Small head-of-board previews for display, computed once per data version
+_preview_cache = {}
+
+# Column chosen for each purpose (sector, status, ...) per board, resolved once per data version
+_resolver_cache = {}
+
+# Full-board category breakdowns per board, computed once per data version
+_breakdowns_cache = {}
+BREAKDOWN_COLUMNS = {
+    "work_orders": ["Execution Status", "Sector"],
+    "deals": ["Deal Stage", "Deal Status", "Sector/service"],
+}
+
+
+def get_data_version():
+    """Get the current data version (changes whenever the cache is refreshed)."""
+    return _data_version
+
+
+def _bump_data_version():
+    global _data_version
+    with _derived_lock:
+        _data_version += 1
+        _numeric_cache.clear()
+        _codes_cache.clear()
+        _breakdowns_cache.clear()
+        _preview_cache.clear()
+        _resolver_cache.clear()
+        _dates_cache.clear()
+        _quarter_rows_cache.clear()
+
+
+def _get_derived(cache, key, compute):
+    """Get a value from one of the per-data-version caches, computing it on a miss.
+
+    The result is only stored if the data version is unchanged once it is computed, so a
+    refresh from another session mid-computation can't leave old-data values cached.
+    """
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        version = _data_version
+        value = compute()
+        with _derived_lock:
+            if version == _data_version:
+                cache[key] = value
+    return value
+
+
+def _disk_cache_path(board, board_id):
+    return os.path.join(_DISK_CACHE_DIR, f"{board}-{board_id}.parquet")
+
+
+def _read_disk_cache(board, board_id):
+    """Load a cleaned board from disk if it is younger than the TTL, else None."""
+    path = _disk_cache_path(board, board_id)
+    try:
+        if time.time() - os.path.getmtime(path) > _DISK_CACHE_TTL:
+            return None
+        return pd.read_parquet(path)
+    except Exception:
+        return None
+
+
+def _write_disk_cache(board, board_id, df):
+    """Persist a cleaned board to disk; failures only cost the next cold start."""
+    path = _disk_cache_path(board, board_id)
+    try:
+        os.makedirs(_DISK_CACHE_DIR, exist_ok=True)
+        df.to_parquet(path + ".tmp", compression="zstd")
+        os.replace(path + ".tmp", path)
+    except Exception:
+        pass
+
 
 def get_work_orders_df(force_refresh=False):
     """Get Work Orders DataFrame with caching."""
     if "work_orders" not in _cache or force_refresh:
-        data = fetch_board_items(WORK_ORDERS_BOARD_ID)
-        df = monday_json_to_dataframe(data)
-        df = clean_dataframe(df)
+        df = None if force_refresh else _read_disk_cache("work_orders", WORK_ORDERS_BOARD_ID)
+        if df is None:
+            df = board_items_to_dataframe(*open_board_items(WORK_ORDERS_BOARD_ID))
+            df = _compact_categories(clean_dataframe(df))
+            _write_disk_cache("work_orders", WORK_ORDERS_BOARD_ID, df)
         _cache["work_orders"] = df
-    return _cache["work_orders"].copy()
+        if force_refresh:
+            _bump_data_version()
+    return _cache["work_orders"].copy(deep=False)  # lazy under Copy-on-Write
 
 
 def get_deals_df(force_refresh=False):
     """Get Deals DataFrame with caching."""
     if "deals" not in _cache or force_refresh:
-        data = fetch_board_items(DEALS_BOARD_ID)
-        df = monday_json_to_dataframe(data)
-        df = clean_dataframe(df)
+        df = None if force_refresh else _read_disk_cache("deals", DEALS_BOARD_ID)
+        if df is None:
+            df = board_items_to_dataframe(*open_board_items(DEALS_BOARD_ID))
+            df = _compact_categories(clean_dataframe(df))
+            _write_disk_cache("deals", DEALS_BOARD_ID, df)
         _cache["deals"] = df
-    return _cache["deals"].copy()
+        if force_refresh:
+            _bump_data_version()
+    return _cache["deals"].copy(deep=False)  # lazy under Copy-on-Write
 
 
 def clear_cache():
-    """Clear the data cache."""
+    """Clear the data cache, including the on-disk copies."""
     _cache.clear()
+    for board, board_id in (("work_orders", WORK_ORDERS_BOARD_ID), ("deals", DEALS_BOARD_ID)):
+        try:
+            os.remove(_disk_cache_path(board, board_id))
+        except OSError:
+            pass
+    _bump_data_version()
+
+
+def load_all_boards():
+    """Make sure both boards are cached, fetching missing ones concurrently (the fetches are I/O-bound)."""
+    loaders = [loader for board, loader in (("work_orders", get_work_orders_df), ("deals", get_deals_df))
+               if board not in _cache]
+    if len(loaders) > 1:
+        with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+            for future in [executor.submit(loader) for loader in loaders]:
+                future.result()
+    elif loaders:
+        loaders[0]()
+
+
+def _get_cached_board(board):
+    """Get the cached DataFrame for a board without copying it (callers must not modify it)."""
+    if board not in _cache:
+        if board == "work_orders":
+            get_work_orders_df()
+        else:
+            get_deals_df()
+    return _cache[board]
+
+
+def get_numeric_column(board, column):
+    """Get a cached board column coerced to float (parsed once, not per question).
+
+    The returned Series shares the cached DataFrame's index, so it can be aligned
+    to a filtered frame with ``.loc[df.index]``.
+    """
+    def compute():
+        return pd.to_numeric(_get_cached_board(board)[column], errors='coerce')
+    
+    return _get_derived(_numeric_cache, (board, column), compute)
+
+
+def get_category_codes(board, column):
+    """Get a cached board column factorized into (codes, uniques), computed once per data version."""
+    def compute():
+        return pd.factorize(_get_cached_board(board)[column])
+    
+    return _get_derived(_codes_cache, (board, column), compute)
+
+
+def _counts_from_codes(codes, uniques):
+    """Count rows per label from factorized codes, most common first (like value_counts().to_dict())."""
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    order = np.argsort(-counts, kind="stable")
+    return {uniques[i]: int(counts[i]) for i in order if counts[i] > 0}
+
+
+def fast_counts(series):
+    """Drop-in for series.value_counts().to_dict() using factorize + bincount."""
+    codes, uniques = pd.factorize(series)
+    return _counts_from_codes(codes, uniques)
+
+
+def aggregate_board(board, df, value_columns=(), category_columns=()):
+    """Aggregate a (possibly filtered) view of a cached board in one vectorized sweep.
+
+    Value columns are reduced to (sum, non-null count) from the pre-parsed float
+    arrays, and category columns to row counts per label (most common first, like
+    value_counts) from the pre-factorized codes. Columns missing from `df` are skipped.
+    """
+    rows = _get_cached_board(board).index.get_indexer(df.index)
+    if (rows < 0).any():
+        # -1 would silently read the last row; df must be a view of the board as currently cached
+        raise ValueError(f"Rows of the given frame are not in the cached {board} board (was the data refreshed?)")
+    
+    totals = {}
+    for column in value_columns:
+        if column in df.columns:
+            values = get_numeric_column(board, column).to_numpy()[rows]
+            valid = ~np.isnan(values)
+            totals[column] = (float(values[valid].sum()), int(valid.sum()))
+    
+    breakdowns = {}
+    for column in category_columns:
+        if column in df.columns:
+            codes, uniques = get_category_codes(board, column)
+            breakdowns[column] = _counts_from_codes(codes[rows], uniques)
+    
+    return totals, breakdowns
+
+
+def get_precomputed_breakdowns(board):
+    """Get a board's full-board category breakdowns ({column: {label: count}}), computed once per data version."""
+    def compute():
+        df = _get_cached_board(board)
+        _, breakdowns = aggregate_board(board, df, category_columns=BREAKDOWN_COLUMNS[board])
+        return breakdowns
+    
+    return _get_derived(_breakdowns_cache, board, compute)
+
+
+def get_preview(board, rows=10):
+    """Get the first rows of a board and its total row count, cached per data version."""
+    def compute():
+        df = _get_cached_board(board)
+        return df.iloc[:rows].copy(), len(df)
+    
+    return _get_derived(_preview_cache, (board, rows), compute)
+
+
+# Substrings that identify a column's purpose (matched case-insensitively against column names)
+_SECTOR_TERMS = ('sector',)
+_STATUS_TERMS = ('status', 'stage', 'state')
+_REVENUE_TERMS = ('value', 'amount', 'revenue', 'total', 'price')
+_DATE_TERMS = ('date',)
+
+
+@lru_cache(maxsize=64)
+def _find_col(columns, terms):
+    """Find the first column whose name contains any of the terms (memoized per column tuple)."""
+    for col in columns:
+        col_lower = col.lower()
+        if any(term in col_lower for term in terms):
+            return col
+    return None
+
+
+_COLUMN_PURPOSES = {
+    "sector": _SECTOR_TERMS,
+    "status": _STATUS_TERMS,
+    "revenue": _REVENUE_TERMS,
+    "date": _DATE_TERMS,
+}
+
+
+def _resolve_columns(board):
+    """Get the cached board's column for each purpose ({purpose: column or None}), resolved once per data version."""
+    def compute():
+        columns = tuple(_get_cached_board(board).columns)
+        return {purpose: _find_col(columns, terms) for purpose, terms in _COLUMN_PURPOSES.items()}
+    
+    return _get_derived(_resolver_cache, board, compute)
+
+
+# Sector/status columns with fewer distinct values than this share of rows are stored as Categoricals
+_CATEGORY_MAX_RATIO = 0.05
+
+
+def _compact_categories(df):
+    """Store low-cardinality sector/status text columns as Categoricals (small integer codes per row)."""
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        col_lower = col.lower()
+        if any(term in col_lower for term in _SECTOR_TERMS + _STATUS_TERMS):
+            n_unique = df[col].nunique()
+            if 0 < n_unique < len(df) * _CATEGORY_MAX_RATIO:
+                df[col] = df[col].astype("category")
+    return df
 
 
 def get_all_columns():
     """Get all column names from both boards."""
+    load_all_boards()
     work_orders = get_work_orders_df()
     deals = get_deals_df()
     
@@ -64,11 +328,7 @@ def analyze_pipeline():
     }
     
     # Find sector column (might have different names)
-    sector_col = None
-    for col in deals.columns:
-        if 'sector' in col.lower():
-            sector_col = col
-            break
+    sector_col = _resolve_columns("deals")["sector"]
     
     if sector_col and sector_col in deals.columns:
         sectors = deals[sector_col]
@@ -77,14 +337,10 @@ def analyze_pipeline():
         result["unique_sectors"] = len(result["sectors"])
     
     # Find stage/status column
-    stage_col = None
-    for col in deals.columns:
-        if any(term in col.lower() for term in ['stage', 'status', 'state']):
-            stage_col = col
-            break
+    stage_col = _resolve_columns("deals")["status"]
     
     if stage_col and stage_col in deals.columns:
-        result["stages"] = deals[stage_col].value_counts().to_dict()
+        result["stages"] = fast_counts(deals[stage_col])
     
     return result
 
@@ -93,27 +349,25 @@ def get_revenue_metrics(df, revenue_col=None):
     """Calculate revenue metrics from a DataFrame."""
     if revenue_col is None:
         # Try to find revenue column
-        for col in df.columns:
-            if any(term in col.lower() for term in ['value', 'amount', 'revenue', 'total', 'price']):
-                revenue_col = col
-                break
+        revenue_col = _find_col(tuple(df.columns), _REVENUE_TERMS)
     
     if not revenue_col or revenue_col not in df.columns:
         return {"error": "No revenue column found"}
     
-    # Convert to numeric
-    values = pd.to_numeric(df[revenue_col], errors='coerce')
-    values = values.dropna()
+    # Convert to a plain float array once; the average reuses the total instead of a fifth pass
+    values = pd.to_numeric(df[revenue_col], errors='coerce').to_numpy(dtype="float64", na_value=np.nan)
+    values = values[~np.isnan(values)]
     
-    if len(values) == 0:
+    if values.size == 0:
         return {"error": "No valid numeric values found"}
     
+    total = float(values.sum())
     return {
-        "total": float(values.sum()),
-        "average": float(values.mean()),
+        "total": total,
+        "average": total / values.size,
         "min": float(values.min()),
         "max": float(values.max()),
-        "count": len(values),
+        "count": int(values.size),
         "column_used": revenue_col
     }
 
@@ -124,18 +378,15 @@ def get_sector_breakdown(board="deals"):
         df = get_deals_df()
     else:
         df = get_work_orders_df()
+        board = "work_orders"
     
     # Find sector column
-    sector_col = None
-    for col in df.columns:
-        if 'sector' in col.lower():
-            sector_col = col
-            break
+    sector_col = _resolve_columns(board)["sector"]
     
     if not sector_col:
         return {"error": "No sector column found"}
     
-    breakdown = df[sector_col].value_counts().to_dict()
+    breakdown = fast_counts(df[sector_col])
     
     return {
         "column": sector_col,
@@ -149,18 +400,15 @@ def get_status_breakdown(board="work_orders"):
         df = get_work_orders_df()
     else:
         df = get_deals_df()
+        board = "deals"
     
     # Find status column
-    status_col = None
-    for col in df.columns:
-        if any(term in col.lower() for term in ['status', 'stage', 'state']):
-            status_col = col
-            break
+    status_col = _resolve_columns(board)["status"]
     
     if not status_col:
         return {"error": "No status column found"}
     
-    breakdown = df[status_col].value_counts().to_dict()
+    breakdown = fast_counts(df[status_col])
     
     return {
         "column": status_col,
@@ -170,16 +418,15 @@ def get_status_breakdown(board="work_orders"):
 
 def filter_by_sector(df, sector):
     """Filter DataFrame by sector (case-insensitive, partial match)."""
-    sector_col = None
-    for col in df.columns:
-        if 'sector' in col.lower():
-            sector_col = col
-            break
+    sector_col = _find_col(tuple(df.columns), _SECTOR_TERMS)
     
     if not sector_col:
         return df
     
-    mask = df[sector_col].str.lower().str.contains(sector.lower(), na=False)
+    # Lowercase and match each distinct label once rather than every row
+    codes, uniques = pd.factorize(df[sector_col])
+    hits = pd.Series(uniques).str.lower().str.contains(sector.lower(), na=False, regex=False)
+    mask = np.append(hits.to_numpy(dtype=bool), False)[codes]  # code -1 (missing) hits the trailing False
     return df[mask]
 
 
@@ -187,16 +434,12 @@ def filter_by_date_range(df, start_date=None, end_date=None, date_column=None):
     """Filter DataFrame by date range."""
     if date_column is None:
         # Try to find a date column
-        for col in df.columns:
-            if 'date' in col.lower():
-                date_column = col
-                break
+        date_column = _find_col(tuple(df.columns), _DATE_TERMS)
     
     if not date_column or date_column not in df.columns:
         return df
     
-    df = df.copy()
-    df[date_column] = pd.to_datetime(df[date_column], errors='coerce')
+    df = df.assign(**{date_column: pd.to_datetime(df[date_column], errors='coerce')})
     
     if start_date:
         start = pd.to_datetime(start_date)
@@ -209,6 +452,38 @@ def filter_by_date_range(df, start_date=None, end_date=None, date_column=None):
     return df
 
 
+def _get_board_dates(board):
+    """Get the cached board's dated rows as (row positions, dates) sorted by date, or None if it has no date column.
+
+    Parsed and sorted once per data version, so date ranges become two binary searches.
+    """
+    def compute():
+        df = _get_cached_board(board)
+        date_column = _resolve_columns(board)["date"]
+        if not date_column:
+            return None
+        dates = pd.to_datetime(df[date_column], errors='coerce').to_numpy()
+        positions = np.flatnonzero(~pd.isna(dates))
+        order = positions[np.argsort(dates[positions], kind="stable")]
+        return order, dates[order]
+    
+    return _get_derived(_dates_cache, board, compute)
+
+
+def _get_quarter_rows(board, start_date, end_date):
+    """Get the cached board's row positions (in board order) for an inclusive date range, or None if it has no date column."""
+    def compute():
+        board_dates = _get_board_dates(board)
+        if board_dates is None:
+            return None
+        order, dates = board_dates
+        lo = np.searchsorted(dates, np.datetime64(pd.to_datetime(start_date)), side="left")
+        hi = np.searchsorted(dates, np.datetime64(pd.to_datetime(end_date)), side="right")
+        return np.sort(order[lo:hi])
+    
+    return _get_derived(_quarter_rows_cache, (board, start_date, end_date), compute)
+
+
 def get_quarterly_data(year=None, quarter=None):
     """Get data for a specific quarter."""
     if year is None:
@@ -227,20 +502,26 @@ def get_quarterly_data(year=None, quarter=None):
     
     start_date, end_date = quarter_ranges[quarter]
     
-    deals = get_deals_df()
-    work_orders = get_work_orders_df()
+    load_all_boards()
+    
+    # Row positions are precomputed per quarter, so repeat questions skip date parsing and comparison
+    quarterly = {}
+    for board, df in (("deals", get_deals_df()), ("work_orders", get_work_orders_df())):
+        rows = _get_quarter_rows(board, start_date, end_date)
+        quarterly[board] = df if rows is None else df.iloc[rows]
     
     return {
         "quarter": f"Q{quarter} {year}",
         "start_date": start_date,
         "end_date": end_date,
-        "deals": filter_by_date_range(deals, start_date, end_date),
-        "work_orders": filter_by_date_range(work_orders, start_date, end_date)
+        "deals": quarterly["deals"],
+        "work_orders": quarterly["work_orders"]
     }
 
 
 def get_data_summary():
     """Get a comprehensive summary of all data."""
+    load_all_boards()
     work_orders = get_work_orders_df()
     deals = get_deals_df()
     